@@ -1,11 +1,14 @@
 import pytest
 from pathlib import Path
 
+from utils.config import share_config
+
 # Import fixtures to make them available to all tests
 pytest_plugins = ["fixtures.fixtures"]
 
 
 def pytest_configure(config):
-    """Create reports directory if it doesn't exist"""
+    """Create reports directory and share the resolved configuration with worker processes"""
     reports_dir = Path("reports")
     reports_dir.mkdir(exist_ok=True)
+    share_config()
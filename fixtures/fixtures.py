@@ -1,56 +1,78 @@
 from typing import Any, Generator
-import os
 import pytest
 from playwright.sync_api import Page, Browser, BrowserContext
 from pathlib import Path
-from utils.utils import load_config
+from utils.config import (
+    BrowserConfig, Config, ReportingConfig, TestConfig, VisualConfig, get_config
+)
+from utils.visual import BaselineStore, VisualChecker
+from pages.registry import PageObjectRegistry
 from pytest_html import extras
 
 
 @pytest.fixture(scope="session")
-def browser_config():
-    """Load browser configuration and override settings for CI environment"""
-    config = load_config("browser.json")
-    
-    # Detect if running in GitHub actions and adjust settings
-    if os.getenv("GITHUB_ACTIONS") == "true":
-        config["headless"] = True
-        config["browser"] = "chromium"
-    
-    return config
+def kiwi_config() -> Config:
+    """Resolved configuration (files, profile and environment overrides)"""
+    return get_config()
+
+
+@pytest.fixture(scope="session")
+def browser_config(kiwi_config: Config) -> BrowserConfig:
+    """Browser configuration, CI settings come from the 'ci' profile"""
+    return kiwi_config.browser
+
+
+@pytest.fixture(scope="session")
+def test_config(kiwi_config: Config) -> TestConfig:
+    """Test configuration"""
+    return kiwi_config.test
 
 
 @pytest.fixture(scope="session")
-def test_config():
-    """Load test configuration"""
-    return load_config("test.json")
+def reporting_config(kiwi_config: Config) -> ReportingConfig:
+    """Reporting configuration"""
+    return kiwi_config.reporting
 
 
 @pytest.fixture(scope="session")
-def reporting_config():
-    """Load reporting configuration"""
-    return load_config("reporting.json")
+def visual_config(reporting_config: ReportingConfig) -> VisualConfig:
+    """Visual regression settings, baselines can be refreshed with UPDATE_VISUAL_BASELINES=true"""
+    return reporting_config.visual
 
 
 @pytest.fixture(scope="session")
-def base_url(test_config) -> str:
+def visual(visual_config: VisualConfig) -> VisualChecker:
+    """Visual checker shared by all tests so decoded baselines are reused"""
+    return VisualChecker(
+        BaselineStore(visual_config.baseline_path),
+        diff_dir=visual_config.diff_path,
+        tolerance=visual_config.tolerance,
+        perceptual=visual_config.perceptual,
+        threshold=visual_config.threshold,
+        max_diff_ratio=visual_config.max_diff_ratio,
+        update_baselines=visual_config.update_baselines
+    )
+
+
+@pytest.fixture(scope="session")
+def base_url(test_config: TestConfig) -> str:
     """Get base URL from test config"""
-    return test_config.get("base_url", "")
+    return test_config.base_url
 
 
 @pytest.fixture(scope="session")
-def browser_type_launch_args(browser_config):
+def browser_type_launch_args(browser_config: BrowserConfig):
     """Configure browser launch arguments"""
     return {
-        "headless": browser_config.get("headless", True),
-        "slow_mo": browser_config.get("slow_mo", 0)
+        "headless": browser_config.headless,
+        "slow_mo": browser_config.slow_mo
     }
 
 
 @pytest.fixture(scope="session")
-def browser_type(playwright, browser_config):
+def browser_type(playwright, browser_config: BrowserConfig):
     """Select browser type from config"""
-    browser_name = browser_config.get("browser", "chromium")
+    browser_name = browser_config.browser
     if browser_name == "firefox":
         return playwright.firefox
     elif browser_name == "webkit":
@@ -68,21 +90,21 @@ def browser(browser_type: Browser, browser_type_launch_args) -> Generator[Browse
 
 
 @pytest.fixture
-def pwcontext(browser: Browser, browser_config, base_url) -> Generator[BrowserContext, Any, Any]:
+def pwcontext(browser: Browser, browser_config: BrowserConfig, base_url) -> Generator[BrowserContext, Any, Any]:
     """Create browser context with configuration"""
     context = browser.new_context(
-        viewport=browser_config.get("viewport", {"width": 1920, "height": 1080}),
+        viewport=browser_config.viewport.as_dict(),
         base_url=base_url
     )
     yield context
     context.close()
 
 @pytest.fixture
-def page(pwcontext: BrowserContext, test_config, request) -> Generator[Page, Any, Any]:
+def page(pwcontext: BrowserContext, test_config: TestConfig, request) -> Generator[Page, Any, Any]:
     """Create a new page for each test with failure capture"""
     
     page = pwcontext.new_page()
-    page.set_default_timeout(test_config.get("timeout", 30000))
+    page.set_default_timeout(test_config.timeout)
     
     yield page
     
@@ -107,4 +129,7 @@ def page(pwcontext: BrowserContext, test_config, request) -> Generator[Page, Any
     page.close()
 
 
-
+@pytest.fixture
+def page_objects(page: Page) -> PageObjectRegistry:
+    """Page objects of the test page, shared by all steps of a scenario"""
+    return PageObjectRegistry(page)
@@ -1,4 +1,5 @@
 import time
+from functools import cached_property
 from playwright.sync_api import Page, Locator, expect
 from typing import Union, List
 
@@ -106,13 +107,26 @@ class DirectionsRadioGroup:
     
     def __init__(self, page: Page):
         self.page = page
-        self.one_way_radio = RadioButton(page, "ModePopupOption-oneWay")
-        self.return_trip_radio = RadioButton(page, "ModePopupOption-return")
-        self.mutlicity_trip_radio = RadioButton(page, "ModePopupOption-multicity")
-        self.nomad_trip_radio = RadioButton(page, "ModePopupOption-nomad")
         self.directions_select = page.locator('[data-test^="SearchFormModesPicker"]')
         self.dialog = page.locator("[role='dialog'][data-test='ModesField']")
 
+    # Radio buttons are created on first use and reused afterwards
+    @cached_property
+    def one_way_radio(self) -> RadioButton:
+        return RadioButton(self.page, "ModePopupOption-oneWay")
+
+    @cached_property
+    def return_trip_radio(self) -> RadioButton:
+        return RadioButton(self.page, "ModePopupOption-return")
+
+    @cached_property
+    def mutlicity_trip_radio(self) -> RadioButton:
+        return RadioButton(self.page, "ModePopupOption-multicity")
+
+    @cached_property
+    def nomad_trip_radio(self) -> RadioButton:
+        return RadioButton(self.page, "ModePopupOption-nomad")
+
     def is_visible(self) -> bool:
         return self.directions_select.is_visible()
     
@@ -332,12 +346,33 @@ class SearchFlightsControl:
     
     def __init__(self, page: Page):
         self.page = page
-        self.directions_radio_group = DirectionsRadioGroup(page)
-        self.origin_input = DestinationInputBox(page, "PlacePickerInput-origin")
-        self.destination_input = DestinationInputBox(page, "PlacePickerInput-destination")
-        self.calendar_field = CalendarField(page, '[data-test="SearchDateInput"]')
-        self.kiwi_hotels_checkbox = Checkbox(page, "accommodationCheckbox")
         self.search_button = page.locator('[data-test="LandingSearchButton"]')
+        # the form has no data-test of its own, use the closest element holding both
+        # the trip type picker and the search button
+        self.container = self.search_button.locator(
+            'xpath=ancestor::*[.//*[starts-with(@data-test, "SearchFormModesPicker")]][1]'
+        )
+
+    # Child controls are created on first use and reused afterwards
+    @cached_property
+    def directions_radio_group(self) -> DirectionsRadioGroup:
+        return DirectionsRadioGroup(self.page)
+
+    @cached_property
+    def origin_input(self) -> DestinationInputBox:
+        return DestinationInputBox(self.page, "PlacePickerInput-origin")
+
+    @cached_property
+    def destination_input(self) -> DestinationInputBox:
+        return DestinationInputBox(self.page, "PlacePickerInput-destination")
+
+    @cached_property
+    def calendar_field(self) -> CalendarField:
+        return CalendarField(self.page, '[data-test="SearchDateInput"]')
+
+    @cached_property
+    def kiwi_hotels_checkbox(self) -> Checkbox:
+        return Checkbox(self.page, "accommodationCheckbox")
     
     def click_search(self):
         """Click the search button"""
@@ -1,10 +1,11 @@
+from functools import cached_property
 from typing import Union
 from playwright.sync_api import Page, Locator
 
 from pages.controls import RadioButton, SearchFlightsControl
-from utils.utils import load_config
+from utils.config import get_config
 
-DEFAULT_TIMEOUT = load_config("test.json").get("timeout", 20000)
+DEFAULT_TIMEOUT = get_config().test.timeout
 
 class BasePage:
     """Base page class with common methods"""
@@ -40,16 +41,16 @@ class PrivacyPage(BasePage):
 class KiwiStartPage(BasePage):
     """Page object for Kiwi.com start page"""
     
-    def __init__(self, page: Page):
-        super().__init__(page)
-        self.SearchFlightsControl = SearchFlightsControl(page)
+    @cached_property
+    def SearchFlightsControl(self) -> SearchFlightsControl:
+        return SearchFlightsControl(self.page)
     
     def wait_for_load(self, timeout: int = DEFAULT_TIMEOUT):
         self.SearchFlightsControl.wait_until_visible(timeout=timeout)
 
     def navigate_to(self, accept_cookies: bool = True, url: Union[str, None] = None):
         if url is None:
-            url = load_config("test.json").get("base_url", "https://www.kiwi.com/en/")
+            url = get_config().test.base_url
         super().navigate_to(url)
         self.wait_for_load()
         if accept_cookies:
@@ -62,6 +63,7 @@ class SearchResultsPage(BasePage):
         super().__init__(page)
         self.loading_line = self.page.locator('[data-test="LoadingLine"]')
         self.results_list = self.page.locator('[data-test="ResultList-results"]')
+        self.result_cards = self.results_list.locator('[data-test="ResultCardWrapper"]')
     
     def wait_for_results(self, timeout: int = DEFAULT_TIMEOUT):
         """Wait for search results to load"""
@@ -0,0 +1,36 @@
+from typing import Dict, Type, TypeVar
+
+from playwright.sync_api import Page, Frame
+
+T = TypeVar("T")
+
+
+class PageObjectRegistry:
+    """
+    Page objects bound to a single Playwright Page.
+
+    Page objects are created on first request and reused until the page
+    navigates away, so steps sharing a page also share the page objects
+    (and their lazily created controls).
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._objects: Dict[type, object] = {}
+        page.on("framenavigated", self._on_frame_navigated)
+
+    def get(self, page_object_cls: Type[T]) -> T:
+        """Return the cached instance of page_object_cls, creating it if needed"""
+        page_object = self._objects.get(page_object_cls)
+        if page_object is None:
+            page_object = page_object_cls(self.page)
+            self._objects[page_object_cls] = page_object
+        return page_object
+
+    def invalidate(self):
+        """Drop all cached page objects"""
+        self._objects.clear()
+
+    def _on_frame_navigated(self, frame: Frame):
+        if frame == self.page.main_frame:
+            self.invalidate()
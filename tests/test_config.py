@@ -0,0 +1,138 @@
+import dataclasses
+
+import pytest
+
+from utils.config import (
+    RESOLVED_CONFIG_ENV, XDIST_WORKER_ENV, ConfigError, env_overrides, get_config, read_config,
+    share_config,
+)
+
+
+def test_local_profile_is_the_default():
+    config = read_config(environ={})
+    assert config.profile == "local"
+    assert config.browser.headless is False
+    assert config.browser.viewport.width == 1920
+
+
+def test_github_actions_selects_ci_profile():
+    config = read_config(environ={"GITHUB_ACTIONS": "true"})
+    assert config.profile == "ci"
+    assert config.browser.headless is True
+    assert config.browser.browser == "chromium"
+
+
+def test_explicit_profile_wins_over_github_actions():
+    config = read_config(environ={"GITHUB_ACTIONS": "true", "KIWI_PROFILE": "load-test"})
+    assert config.profile == "load-test"
+
+
+def test_unknown_profile():
+    with pytest.raises(ConfigError, match="Unknown configuration profile"):
+        read_config("nightly", environ={})
+
+
+def test_environment_overrides_are_nested():
+    assert env_overrides({
+        "KIWI_BROWSER__VIEWPORT__WIDTH": "1280",
+        "KIWI_TEST__BASE_URL": "https://www.kiwi.com/de/",
+        "KIWI_REPORTING__VISUAL__THRESHOLD": "0.2",
+        "KIWI_PROFILE": "ci",
+        "HOME": "/root",
+    }) == {
+        "browser": {"viewport": {"width": "1280"}},
+        "test": {"base_url": "https://www.kiwi.com/de/"},
+        "reporting": {"visual": {"threshold": "0.2"}},
+    }
+
+
+def test_environment_values_are_converted_by_field_type():
+    config = read_config(environ={
+        "KIWI_BROWSER__VIEWPORT__WIDTH": "1280",
+        "KIWI_REPORTING__VISUAL__THRESHOLD": "0.2",
+        "KIWI_TEST__API_BASE_URL": "123",
+        "KIWI_TEST__BASE_URL": "null",
+        "KIWI_REPORTING__VISUAL__BASELINE_PATH": "2024",
+    })
+    assert config.browser.viewport.width == 1280
+    assert config.reporting.visual.threshold == 0.2
+    assert config.test.api_base_url == "123"
+    assert config.test.base_url == "null"
+    assert config.reporting.visual.baseline_path == "2024"
+
+
+def test_environment_object_override_replaces_nested_keys():
+    config = read_config(environ={"KIWI_BROWSER__VIEWPORT": '{"width": 1280, "height": 720}'})
+    assert config.browser.viewport.as_dict() == {"width": 1280, "height": 720}
+
+
+def test_environment_overrides_win_over_profile():
+    config = read_config("ci", environ={"KIWI_BROWSER__HEADLESS": "false", "KIWI_TEST__TIMEOUT": "5000"})
+    assert config.browser.headless is False
+    assert config.test.timeout == 5000
+    assert config.browser.viewport.height == 1080
+
+
+@pytest.mark.parametrize("value, expected", [("true", True), ("1", False), ("yes", False), ("", False)])
+def test_update_visual_baselines_alias(value, expected):
+    config = read_config(environ={"UPDATE_VISUAL_BASELINES": value})
+    assert config.reporting.visual.update_baselines is expected
+
+
+@pytest.mark.parametrize("value", ["false", "1", ""])
+def test_update_visual_baselines_alias_keeps_configured_value(value):
+    config = read_config(environ={
+        "KIWI_REPORTING__VISUAL__UPDATE_BASELINES": "true",
+        "UPDATE_VISUAL_BASELINES": value,
+    })
+    assert config.reporting.visual.update_baselines is True
+
+
+@pytest.mark.parametrize("environ, message", [
+    ({"KIWI_BROWSER__HEADLES": "true"}, "Unknown configuration keys in browser"),
+    ({"KIWI_TEST__TIMEOUT": "true"}, "test.timeout must be int"),
+    ({"KIWI_TEST__TIMEOUT": "soon"}, "test.timeout must be int"),
+    ({"KIWI_BROWSER_HEADLESS": "true"}, "Invalid configuration override KIWI_BROWSER_HEADLESS"),
+    ({"KIWI_BROWSERS__HEADLESS": "true"}, "Invalid configuration override KIWI_BROWSERS__HEADLESS"),
+    ({"KIWI_TEST__": "1"}, "Invalid configuration override KIWI_TEST__"),
+    ({"KIWI_BROWSER__VIEWPORT": "1280"}, "browser.viewport must be an object"),
+    ({"KIWI_BROWSER__VIEWPORT": "{}", "KIWI_BROWSER__VIEWPORT__WIDTH": "1"}, "Conflicting configuration overrides"),
+    ({"KIWI_BROWSER__VIEWPORT__WIDTH": "1", "KIWI_BROWSER__VIEWPORT": "{}"}, "Conflicting configuration overrides"),
+    ({"KIWI_BROWSER__BROWSER": "edge"}, "browser.browser must be one of"),
+    ({"KIWI_REPORTING__VISUAL__THRESHOLD": "2"}, "reporting.visual.threshold must be within 0..1"),
+])
+def test_invalid_configuration(environ, message):
+    with pytest.raises(ConfigError, match=message):
+        read_config(environ=environ)
+
+
+def test_config_is_immutable():
+    config = read_config(environ={})
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.browser.headless = True
+
+
+def test_shared_config_round_trip_in_xdist_worker(monkeypatch):
+    # registered so monkeypatch restores the value published by conftest
+    monkeypatch.setenv(RESOLVED_CONFIG_ENV, "")
+    monkeypatch.setenv(XDIST_WORKER_ENV, "gw0")
+    config = read_config(environ={"KIWI_PROFILE": "load-test", "KIWI_TEST__TIMEOUT": "1234"})
+    get_config.cache_clear()
+    try:
+        share_config(config)
+        assert get_config() == config
+        assert get_config("ci").profile == "ci"
+    finally:
+        get_config.cache_clear()
+
+
+def test_shared_config_is_ignored_outside_xdist_workers(monkeypatch):
+    monkeypatch.setenv(RESOLVED_CONFIG_ENV, "")
+    monkeypatch.delenv(XDIST_WORKER_ENV, raising=False)
+    config = read_config(environ={"KIWI_PROFILE": "load-test", "KIWI_TEST__TIMEOUT": "1234"})
+    get_config.cache_clear()
+    try:
+        share_config(config)
+        assert get_config().test.timeout != 1234
+    finally:
+        get_config.cache_clear()
@@ -0,0 +1,65 @@
+from pages.controls import DestinationInputBox
+from pages.pages import KiwiStartPage, SearchResultsPage
+from pages.registry import PageObjectRegistry
+
+
+class FakeLocator:
+    def locator(self, selector: str) -> "FakeLocator":
+        return FakeLocator()
+
+
+class FakePage:
+    """Just enough of a Playwright Page to build page objects and emit navigation events"""
+
+    def __init__(self):
+        self.main_frame = object()
+        self.handlers = {}
+
+    def on(self, event: str, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event: str, *args):
+        for handler in self.handlers.get(event, []):
+            handler(*args)
+
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator()
+
+
+def test_same_instance_is_returned():
+    registry = PageObjectRegistry(FakePage())
+    kiwi = registry.get(KiwiStartPage)
+    assert registry.get(KiwiStartPage) is kiwi
+    assert registry.get(SearchResultsPage) is not kiwi
+
+
+def test_main_frame_navigation_clears_cache():
+    page = FakePage()
+    registry = PageObjectRegistry(page)
+    kiwi = registry.get(KiwiStartPage)
+    page.emit("framenavigated", page.main_frame)
+    assert registry.get(KiwiStartPage) is not kiwi
+
+
+def test_subframe_navigation_keeps_cache():
+    page = FakePage()
+    registry = PageObjectRegistry(page)
+    kiwi = registry.get(KiwiStartPage)
+    page.emit("framenavigated", object())
+    assert registry.get(KiwiStartPage) is kiwi
+
+
+def test_controls_are_built_on_first_access():
+    kiwi = PageObjectRegistry(FakePage()).get(KiwiStartPage)
+    assert "SearchFlightsControl" not in vars(kiwi)
+
+    control = kiwi.SearchFlightsControl
+    assert control is kiwi.SearchFlightsControl
+    assert "origin_input" not in vars(control)
+    assert "directions_radio_group" not in vars(control)
+
+    origin_input = control.origin_input
+    assert isinstance(origin_input, DestinationInputBox)
+    assert control.origin_input is origin_input
+    assert "destination_input" not in vars(control)
+    assert "one_way_radio" not in vars(control.directions_radio_group)
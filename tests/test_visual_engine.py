@@ -0,0 +1,196 @@
+import time
+
+import numpy as np
+import pytest
+
+import utils.visual
+from utils.visual import (
+    BaselineStore, VisualChecker, build_mask, compare_images, encode_image, perceptual_delta,
+    render_diff,
+)
+
+FULL_HD = (1080, 1920, 3)
+
+
+def solid(color, shape=(20, 30, 3)) -> np.ndarray:
+    return np.full(shape, color, dtype=np.uint8)
+
+
+class FakeElement:
+    def __init__(self, box):
+        self.box = box
+
+    def bounding_box(self):
+        return self.box
+
+
+class FakePage:
+    """Just enough of a Playwright Page for VisualChecker"""
+
+    def __init__(self, pixels: np.ndarray, boxes=(), device_pixel_ratio: float = 1):
+        self.pixels = pixels
+        self.boxes = boxes
+        self.device_pixel_ratio = device_pixel_ratio
+
+    def screenshot(self, **kwargs) -> bytes:
+        return encode_image(self.pixels)
+
+    def evaluate(self, expression: str):
+        return self.device_pixel_ratio
+
+    def locator(self, selector: str):
+        page = self
+
+        class _Locator:
+            def all(self):
+                return [FakeElement(box) for box in page.boxes]
+
+        return _Locator()
+
+
+def test_perceptual_threshold():
+    black = solid(0)
+    assert perceptual_delta(black, solid(255))[0, 0] == pytest.approx(1.0, abs=0.05)
+    # a 10 level grey change is about 0.04 perceptually
+    assert not compare_images(solid(10), black, perceptual=True, threshold=0.1).any()
+    assert compare_images(solid(10), black, perceptual=True, threshold=0.02).all()
+
+
+def test_perceptual_dense_and_sparse_paths_agree():
+    rng = np.random.default_rng(0)
+    expected = rng.integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    actual = rng.integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    dense = compare_images(actual, expected, perceptual=True)
+    sparse_actual = expected.copy()
+    sparse_actual[:5] = actual[:5]
+    sparse = compare_images(sparse_actual, expected, perceptual=True)
+    assert np.array_equal(sparse[:5], dense[:5])
+    assert not sparse[5:].any()
+
+
+def test_tolerance():
+    expected = solid(100)
+    actual = expected.copy()
+    actual[0, 0, 1] = 103
+    assert not compare_images(actual, expected, tolerance=3).any()
+    diff = compare_images(actual, expected, tolerance=2)
+    assert diff[0, 0] and np.count_nonzero(diff) == 1
+
+
+def test_mask_regions_are_clipped():
+    mask = build_mask((10, 10, 3), [(-5, -5, 8, 8), (8.5, 8.5, 10, 10), (20, 20, 5, 5)])
+    assert not mask[:3, :3].any()
+    assert mask[3, 3]
+    assert not mask[8:, 8:].any()
+    assert np.count_nonzero(mask) == 100 - 9 - 4
+
+
+def test_masked_pixels_are_not_reported():
+    expected = solid(0)
+    actual = solid(255)
+    mask = build_mask(actual.shape, [(0, 0, 30, 10)])
+    diff = compare_images(actual, expected, mask)
+    assert not diff[:10].any() and diff[10:].all()
+
+
+def test_size_mismatch():
+    with pytest.raises(ValueError):
+        compare_images(solid(0, (10, 10, 3)), solid(0, (10, 11, 3)))
+
+
+def test_render_diff_is_cropped():
+    expected = solid(200, (100, 100, 3))
+    diff = np.zeros((100, 100), dtype=bool)
+    diff[40:45, 50:52] = True
+    image = render_diff(expected, diff, padding=2)
+    assert image.shape == (9, 6, 3)
+    assert (image[2, 2] == [255, 0, 0]).all()
+    assert render_diff(expected, np.zeros_like(diff)).size == 0
+
+
+def test_store_deduplicates_identical_baselines(tmp_path):
+    store = BaselineStore(tmp_path)
+    pixels = solid(42)
+    assert store.put("start_page", pixels) == store.put("results_page", pixels)
+    assert len(list(store.objects_dir.iterdir())) == 1
+    assert np.array_equal(BaselineStore(tmp_path).get("results_page"), pixels)
+    assert store.get("unknown") is None
+
+
+@pytest.mark.parametrize("name", ["search/form", "../escape", "..", ".hidden", ""])
+def test_store_rejects_unsafe_names(tmp_path, name):
+    store = BaselineStore(tmp_path / "baselines")
+    with pytest.raises(ValueError, match="Invalid baseline name"):
+        store.put(name, solid(0))
+    with pytest.raises(ValueError, match="Invalid baseline name"):
+        store.get(name)
+
+
+def test_index_pointing_at_missing_object_is_a_missing_baseline(tmp_path):
+    store = BaselineStore(tmp_path)
+    digest = store.put("start_page", solid(42))
+    (store.objects_dir / f"{digest}.png").unlink()
+    assert BaselineStore(tmp_path).get("start_page") is None
+
+
+def test_missing_baseline_fails(tmp_path):
+    checker = VisualChecker(BaselineStore(tmp_path / "baselines"), tmp_path / "diff")
+    page = FakePage(solid(42))
+    with pytest.raises(AssertionError, match="no baseline"):
+        checker.assert_matches("start_page", page)
+    assert (tmp_path / "diff" / "start_page_actual.png").exists()
+    assert checker.store.get("start_page") is None
+
+
+def test_update_records_then_matches(tmp_path):
+    store = BaselineStore(tmp_path / "baselines")
+    page = FakePage(solid(42))
+    assert VisualChecker(store, tmp_path, update_baselines=True).check("start_page", page).baseline_created
+    assert VisualChecker(store, tmp_path).assert_matches("start_page", page).diff_pixels == 0
+
+
+def test_failed_check_writes_diff(tmp_path):
+    store = BaselineStore(tmp_path / "baselines")
+    store.put("start_page", solid(0))
+    result = VisualChecker(store, tmp_path / "diff").check("start_page", FakePage(solid(255)))
+    assert not result.passed() and result.diff_path.exists()
+
+
+def test_ignore_regions_use_device_pixels(tmp_path):
+    page = FakePage(solid(0), boxes=[{"x": 5, "y": 10, "width": 20, "height": 4}], device_pixel_ratio=2)
+    assert VisualChecker.ignore_regions(page, ["Banner"]) == [(10, 20, 40, 8)]
+    assert VisualChecker.ignore_regions(page, ["Banner"], scale="css") == [(5, 10, 20, 4)]
+
+
+def test_perceptual_sparse_path_only_evaluates_changed_pixels(monkeypatch):
+    evaluated = []
+
+    def recording_yiq_delta(actual, expected):
+        evaluated.append(actual.shape)
+        return yiq_delta(actual, expected)
+
+    yiq_delta = utils.visual._yiq_delta
+    monkeypatch.setattr(utils.visual, "_yiq_delta", recording_yiq_delta)
+    expected = np.zeros(FULL_HD, dtype=np.uint8)
+    actual = expected.copy()
+    actual[100:110, 200:220] = 255
+    actual[500, 500] = 1  # changed but masked out
+    mask = build_mask(actual.shape, [(490, 490, 20, 20)])
+
+    diff = compare_images(actual, expected, mask, perceptual=True)
+    assert evaluated == [(200, 3)]
+    assert np.count_nonzero(diff) == 200
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("perceptual", [True, False])
+def test_full_hd_comparison_takes_milliseconds(perceptual):
+    rng = np.random.default_rng(0)
+    expected = rng.integers(0, 256, FULL_HD, dtype=np.uint8)
+    actual = rng.integers(0, 256, FULL_HD, dtype=np.uint8)  # worst case, every pixel differs
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        compare_images(actual, expected, perceptual=perceptual)
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < 0.15
@@ -0,0 +1,63 @@
+"""
+Element level visual checks of the search flow. Opt-in (pytest -m visual),
+the live site changes often. Record baselines with UPDATE_VISUAL_BASELINES=true,
+a missing baseline fails the test.
+"""
+import pytest
+from playwright.sync_api import Page
+
+from data.datadef import Airport, TravelDirection
+from pages.controls import CalendarPopup
+from pages.pages import KiwiStartPage, SearchResultsPage
+from utils.visual import VisualChecker
+
+# Fields whose content depends on the current date or the visitor location
+DYNAMIC_SEARCH_FIELDS = ["SearchDateInput", "PlacePickerInput-origin", "PlacePickerInput-destination"]
+
+
+@pytest.mark.visual
+def test_search_flights_control_visual(page: Page, visual: VisualChecker):
+    """Compare the search flights form against the stored baseline."""
+    kiwi = KiwiStartPage(page)
+    kiwi.navigate_to()
+
+    visual.assert_matches(
+        "search_flights_control",
+        kiwi.SearchFlightsControl.container,
+        ignore=DYNAMIC_SEARCH_FIELDS
+    )
+
+
+@pytest.mark.visual
+def test_calendar_popup_visual(page: Page, visual: VisualChecker):
+    """Compare the opened calendar popup against the stored baseline."""
+    kiwi = KiwiStartPage(page)
+    kiwi.navigate_to()
+
+    kiwi.SearchFlightsControl.calendar_field.activate()
+    calendar = CalendarPopup(page)
+    calendar.wait_for_visible()
+
+    visual.assert_matches("calendar_popup", calendar.calendar_popup, ignore=["DaySelected-selected"])
+
+
+@pytest.mark.visual
+def test_result_card_visual(page: Page, visual: VisualChecker):
+    """Compare the first search result card against the stored baseline, prices are ignored."""
+    kiwi = KiwiStartPage(page)
+    kiwi.navigate_to()
+
+    search = kiwi.SearchFlightsControl
+    search.directions_radio_group.select_trip_type(trip_type=TravelDirection.ONE_WAY)
+    search.origin_input.clear()
+    search.origin_input.add_airport(Airport.MAD)
+    search.destination_input.clear()
+    search.destination_input.add_airport(Airport.RTM)
+    search.calendar_field.set_date_plus_days(7)
+    search.kiwi_hotels_checkbox.unselect()
+    search.click_search()
+
+    results = SearchResultsPage(page)
+    results.wait_for_results()
+
+    visual.assert_matches("result_card", results.result_cards.first, ignore=["ResultCardPrice"])
@@ -0,0 +1,283 @@
+import dataclasses
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, get_type_hints
+
+from utils.utils import load_config
+
+# Profile selection and overrides are read from the environment, e.g.
+#   KIWI_PROFILE=load-test
+#   KIWI_BROWSER__HEADLESS=true
+#   KIWI_REPORTING__VISUAL__THRESHOLD=0.2
+PROFILE_ENV = "KIWI_PROFILE"
+ENV_PREFIX = "KIWI_"
+RESOLVED_CONFIG_ENV = "KIWI_RESOLVED_CONFIG"
+# set by pytest-xdist in its worker processes only
+XDIST_WORKER_ENV = "PYTEST_XDIST_WORKER"
+
+PROFILES_DIR = Path(__file__).parent.parent / "config" / "profiles"
+CONFIG_FILES = {
+    "browser": "browser.json",
+    "test": "test.json",
+    "reporting": "reporting.json",
+}
+# Environment variables kept for backward compatibility, like before only "true" has an effect
+ENV_ALIASES = {
+    "UPDATE_VISUAL_BASELINES": ("reporting", "visual", "update_baselines"),
+}
+BROWSERS = ("chromium", "firefox", "webkit")
+
+
+class ConfigError(ValueError):
+    """Raised when the configuration is invalid"""
+
+
+class _EnvValue(str):
+    """Raw environment override, converted according to the type of the field it sets"""
+
+
+@dataclass(frozen=True)
+class Viewport:
+    width: int = 1920
+    height: int = 1080
+
+    def as_dict(self) -> Dict[str, int]:
+        return dataclasses.asdict(self)
+
+
+@dataclass(frozen=True)
+class BrowserConfig:
+    browser: str = "chromium"
+    headless: bool = True
+    viewport: Viewport = field(default_factory=Viewport)
+    timeout: int = 30000
+    slow_mo: int = 0
+
+
+@dataclass(frozen=True)
+class TestConfig:
+    __test__ = False  # not a pytest test class
+
+    base_url: str = "https://www.kiwi.com/en/"
+    api_base_url: str = ""
+    timeout: int = 20000
+    retry_attempts: int = 2
+
+
+@dataclass(frozen=True)
+class VisualConfig:
+    baseline_path: str = "baselines"
+    diff_path: str = "reports/visual"
+    perceptual: bool = True
+    threshold: float = 0.1
+    tolerance: int = 0
+    max_diff_ratio: float = 0.0
+    update_baselines: bool = False
+
+
+@dataclass(frozen=True)
+class ReportingConfig:
+    screenshot_on_failure: bool = True
+    video_on_failure: bool = False
+    trace_on_failure: bool = False
+    html_report: bool = True
+    report_path: str = "reports/report.html"
+    visual: VisualConfig = field(default_factory=VisualConfig)
+
+
+@dataclass(frozen=True)
+class Config:
+    """Complete, validated framework configuration"""
+    profile: str
+    browser: BrowserConfig
+    test: TestConfig
+    reporting: ReportingConfig
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    def validate(self):
+        """Check value ranges, raise ConfigError listing every problem found"""
+        errors = []
+        if self.browser.browser not in BROWSERS:
+            errors.append(f"browser.browser must be one of {BROWSERS}, got '{self.browser.browser}'")
+        for name, value in (("browser.viewport.width", self.browser.viewport.width),
+                            ("browser.viewport.height", self.browser.viewport.height),
+                            ("browser.timeout", self.browser.timeout),
+                            ("test.timeout", self.test.timeout)):
+            if value <= 0:
+                errors.append(f"{name} must be positive, got {value}")
+        for name, value in (("browser.slow_mo", self.browser.slow_mo),
+                            ("test.retry_attempts", self.test.retry_attempts)):
+            if value < 0:
+                errors.append(f"{name} must not be negative, got {value}")
+        visual = self.reporting.visual
+        if not 0 <= visual.tolerance <= 255:
+            errors.append(f"reporting.visual.tolerance must be within 0..255, got {visual.tolerance}")
+        for name, value in (("reporting.visual.threshold", visual.threshold),
+                            ("reporting.visual.max_diff_ratio", visual.max_diff_ratio)):
+            if not 0 <= value <= 1:
+                errors.append(f"{name} must be within 0..1, got {value}")
+        if errors:
+            raise ConfigError("Invalid configuration:\n  " + "\n  ".join(errors))
+
+
+def _build(cls, data: Dict[str, Any], path: str = ""):
+    """Create a dataclass instance from a dict, rejecting unknown keys and wrong types"""
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path or 'config'} must be an object, got {type(data).__name__}")
+    hints = get_type_hints(cls)
+    names = {f.name for f in dataclasses.fields(cls)}
+    unknown = set(data) - names
+    if unknown:
+        raise ConfigError(f"Unknown configuration keys in {path or 'config'}: {sorted(unknown)}")
+
+    values = {}
+    for name, value in data.items():
+        key_path = f"{path}.{name}" if path else name
+        expected = hints[name]
+        if isinstance(value, _EnvValue):
+            value = _parse_env_value(value, expected, key_path)
+        if dataclasses.is_dataclass(expected):
+            values[name] = _build(expected, value, key_path)
+            continue
+        if expected is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise ConfigError(f"{key_path} must be {expected.__name__}, got {value!r}")
+        values[name] = value
+    return cls(**values)
+
+
+def _merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge overlay into a copy of base"""
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _parse_env_value(value: str, expected: type, key_path: str) -> Any:
+    """Keep an environment value as is for str fields, parse it as JSON (true, 10, 0.5, {...}) otherwise"""
+    if expected is str:
+        return str(value)
+    try:
+        return json.loads(value)
+    except ValueError:
+        raise ConfigError(f"{key_path} must be {getattr(expected, '__name__', expected)} "
+                          f"(as JSON), got {str(value)!r}")
+
+
+def env_overrides(environ=None) -> Dict[str, Any]:
+    """
+    Collect KIWI_<SECTION>__<KEY>[__<KEY>] overrides from the environment.
+
+    Values are kept as raw strings and converted in _build once the type of
+    the target field is known. Any other KIWI_* name is rejected as a typo.
+    """
+    environ = os.environ if environ is None else environ
+    overrides: Dict[str, Any] = {}
+
+    def set_path(path, value):
+        node = overrides
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+            if not isinstance(node, dict):
+                raise ConfigError(f"Conflicting configuration overrides for {'.'.join(path)}")
+        if isinstance(node.get(path[-1]), dict):
+            raise ConfigError(f"Conflicting configuration overrides for {'.'.join(path)}")
+        node[path[-1]] = value
+
+    for alias, path in ENV_ALIASES.items():
+        if environ.get(alias) == "true":
+            set_path(path, True)
+    for name, value in environ.items():
+        if not name.startswith(ENV_PREFIX) or name in (PROFILE_ENV, RESOLVED_CONFIG_ENV):
+            continue
+        path = name[len(ENV_PREFIX):].lower().split("__")
+        if path[0] not in CONFIG_FILES or len(path) < 2 or not all(path):
+            raise ConfigError(
+                f"Invalid configuration override {name}, expected {ENV_PREFIX}<SECTION>__<KEY> "
+                f"with SECTION one of {sorted(s.upper() for s in CONFIG_FILES)}"
+            )
+        set_path(path, _EnvValue(value))
+    return overrides
+
+
+def default_profile(environ=None) -> str:
+    """Profile from KIWI_PROFILE, 'ci' on GitHub actions, 'local' otherwise"""
+    environ = os.environ if environ is None else environ
+    if environ.get(PROFILE_ENV):
+        return environ[PROFILE_ENV]
+    if environ.get("GITHUB_ACTIONS") == "true":
+        return "ci"
+    return "local"
+
+
+def load_profile(profile: str) -> Dict[str, Any]:
+    """Load the overrides of a profile from config/profiles/<profile>.json"""
+    profile_path = PROFILES_DIR / f"{profile}.json"
+    if not profile_path.exists():
+        available = sorted(p.stem for p in PROFILES_DIR.glob("*.json"))
+        raise ConfigError(f"Unknown configuration profile '{profile}', available: {available}")
+    with open(profile_path, "r") as f:
+        return json.load(f)
+
+
+def build_config(profile: str, data: Dict[str, Any]) -> Config:
+    """Create and validate a Config from a dict with browser, test and reporting sections"""
+    unknown = set(data) - set(CONFIG_FILES)
+    if unknown:
+        raise ConfigError(f"Unknown configuration sections: {sorted(unknown)}")
+    config = Config(
+        profile=profile,
+        browser=_build(BrowserConfig, data.get("browser", {}), "browser"),
+        test=_build(TestConfig, data.get("test", {}), "test"),
+        reporting=_build(ReportingConfig, data.get("reporting", {}), "reporting"),
+    )
+    config.validate()
+    return config
+
+
+def read_config(profile: Optional[str] = None, environ=None) -> Config:
+    """
+    Read the configuration without caching.
+
+    Layers are applied in order: config/*.json, the profile overrides,
+    then KIWI_* environment variables.
+    """
+    environ = os.environ if environ is None else environ
+    profile = profile or default_profile(environ)
+    data = {section: load_config(filename) for section, filename in CONFIG_FILES.items()}
+    data = _merge(data, load_profile(profile))
+    data = _merge(data, env_overrides(environ))
+    return build_config(profile, data)
+
+
+@lru_cache(maxsize=None)
+def get_config(profile: Optional[str] = None) -> Config:
+    """
+    Return the configuration, loaded once per process and profile.
+
+    pytest-xdist workers reuse the configuration resolved by the controller
+    (see share_config) instead of reading the files again. Other child
+    processes inherit the variable too but resolve their own configuration.
+    """
+    shared = os.environ.get(RESOLVED_CONFIG_ENV)
+    if shared and os.environ.get(XDIST_WORKER_ENV):
+        data = json.loads(shared)
+        if profile is None or profile == data["profile"]:
+            return build_config(data.pop("profile"), data)
+    return read_config(profile)
+
+
+def share_config(config: Optional[Config] = None):
+    """Publish the resolved configuration to pytest-xdist workers"""
+    config = config or get_config()
+    os.environ[RESOLVED_CONFIG_ENV] = json.dumps(config.to_dict())
@@ -0,0 +1,385 @@
+import hashlib
+import io
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+from playwright.sync_api import Page, Locator
+
+# (x, y, width, height) in screenshot (device) pixels
+Region = Tuple[int, int, int, int]
+
+# RGB -> YIQ conversion and channel weights used for perceptual comparison
+# (same model as pixelmatch). Since the conversion is linear the YIQ delta
+# can be computed directly from the RGB delta.
+_RGB_TO_YIQ = np.array([
+    [0.29889531, 0.58662247, 0.11448223],
+    [0.59597799, -0.27417610, -0.32180189],
+    [0.21147017, -0.52261711, 0.31114772],
+], dtype=np.float32)
+_YIQ_WEIGHTS = np.array([0.5053, 0.299, 0.1957], dtype=np.float32)
+_MAX_YIQ_DELTA = 35215.0
+
+DIFF_COLOR = np.array([255, 0, 0], dtype=np.uint8)
+
+# baseline names become file names, no path separators and no leading dot
+BASELINE_NAME = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*")
+
+
+def decode_screenshot(data: bytes) -> np.ndarray:
+    """Decode PNG/JPEG screenshot bytes into an (height, width, 3) uint8 array"""
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def encode_image(pixels: np.ndarray) -> bytes:
+    """Encode an (height, width, 3) uint8 array as PNG bytes"""
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, mode="RGB").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def content_hash(pixels: np.ndarray) -> str:
+    """SHA-256 of the decoded pixels, independent of the PNG encoder used"""
+    digest = hashlib.sha256()
+    digest.update(repr(pixels.shape).encode())
+    digest.update(np.ascontiguousarray(pixels).tobytes())
+    return digest.hexdigest()
+
+
+def build_mask(shape: Tuple[int, ...], regions: Iterable[Region]) -> np.ndarray:
+    """
+    Build a boolean mask of the pixels to compare.
+
+    Args:
+        shape: Shape of the compared images, only height and width are used
+        regions: Regions to ignore, clipped to the image bounds
+    """
+    height, width = shape[:2]
+    mask = np.ones((height, width), dtype=bool)
+    for x, y, w, h in regions:
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        x1, y1 = min(int(np.ceil(x + w)), width), min(int(np.ceil(y + h)), height)
+        if x0 < x1 and y0 < y1:
+            mask[y0:y1, x0:x1] = False
+    return mask
+
+
+def pixel_delta(actual: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """Largest absolute per-channel difference of each pixel (0..255)"""
+    # stay in uint8 and reduce channels pairwise, much faster than max(axis=2) on int16
+    diff = np.maximum(actual, expected)
+    diff -= np.minimum(actual, expected)
+    return np.maximum(np.maximum(diff[..., 0], diff[..., 1]), diff[..., 2])
+
+
+def _yiq_delta(actual: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """Weighted squared YIQ difference (0.._MAX_YIQ_DELTA) of (..., 3) arrays"""
+    # planar float32 arithmetic with in-place updates, a (N, 3) @ (3, 3) matmul
+    # is several times slower on full-HD images
+    red, green, blue = (actual[..., c].astype(np.float32) - expected[..., c] for c in range(3))
+    delta = np.zeros(red.shape, dtype=np.float32)
+    for weight, (wr, wg, wb) in zip(_YIQ_WEIGHTS, _RGB_TO_YIQ):
+        channel = red * wr
+        channel += green * wg
+        channel += blue * wb
+        channel *= channel
+        channel *= weight
+        delta += channel
+    return delta
+
+
+def perceptual_delta(actual: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """Perceived colour difference of each pixel (any (..., 3) arrays) normalised to 0..1"""
+    return np.sqrt(_yiq_delta(actual, expected) / _MAX_YIQ_DELTA)
+
+
+def compare_images(actual: np.ndarray, expected: np.ndarray, mask: Optional[np.ndarray] = None,
+                   tolerance: int = 0, perceptual: bool = False, threshold: float = 0.1) -> np.ndarray:
+    """
+    Compare two images of the same size and return a boolean map of differing pixels.
+
+    Args:
+        actual: Image taken during the test
+        expected: Baseline image
+        mask: Optional boolean mask, pixels set to False are never reported
+        tolerance: Allowed per-channel difference (0..255) when perceptual is False
+        perceptual: Use the YIQ perceptual model instead of raw channel difference
+        threshold: Allowed perceptual difference (0..1) when perceptual is True
+    """
+    if actual.shape != expected.shape:
+        raise ValueError(f"Image sizes differ: {actual.shape} != {expected.shape}")
+    delta = pixel_delta(actual, expected)
+    if not perceptual:
+        diff = delta > tolerance
+        if mask is not None:
+            diff &= mask
+        return diff
+
+    changed = delta > 0
+    if mask is not None:
+        changed &= mask
+    limit = threshold * threshold * _MAX_YIQ_DELTA
+    if np.count_nonzero(changed) < changed.size // 8:
+        # usually only a small part of a screenshot changes, evaluate just those pixels
+        diff = np.zeros_like(changed)
+        diff[changed] = _yiq_delta(actual[changed], expected[changed]) > limit
+        return diff
+    diff = _yiq_delta(actual, expected) > limit
+    diff &= changed
+    return diff
+
+
+def render_diff(expected: np.ndarray, diff: np.ndarray, mask: Optional[np.ndarray] = None,
+                padding: int = 10) -> np.ndarray:
+    """
+    Render a compact diff image cropped to the area containing differences.
+
+    The baseline is shown faded in grayscale, ignored regions are darkened
+    and differing pixels are painted red.
+    """
+    rows = np.flatnonzero(diff.any(axis=1))
+    cols = np.flatnonzero(diff.any(axis=0))
+    if rows.size == 0:
+        return expected[:0, :0]
+    y0, y1 = max(rows[0] - padding, 0), min(rows[-1] + padding + 1, diff.shape[0])
+    x0, x1 = max(cols[0] - padding, 0), min(cols[-1] + padding + 1, diff.shape[1])
+
+    crop = expected[y0:y1, x0:x1].astype(np.uint16)
+    gray = (crop[..., 0] * 77 + crop[..., 1] * 150 + crop[..., 2] * 29) >> 8
+    faded = (255 - ((255 - gray) >> 2)).astype(np.uint8)
+    if mask is not None:
+        faded = np.where(mask[y0:y1, x0:x1], faded, faded >> 1)
+    image = np.repeat(faded[..., None], 3, axis=2)
+    image[diff[y0:y1, x0:x1]] = DIFF_COLOR
+    return image
+
+
+@dataclass(frozen=True)
+class DiffResult:
+    """Outcome of a single visual comparison"""
+    name: str
+    diff_pixels: int
+    compared_pixels: int
+    size_mismatch: bool = False
+    baseline_missing: bool = False
+    baseline_created: bool = False
+    diff_path: Optional[Path] = None
+
+    @property
+    def diff_ratio(self) -> float:
+        if self.size_mismatch or self.baseline_missing:
+            return 1.0
+        return self.diff_pixels / self.compared_pixels if self.compared_pixels else 0.0
+
+    def passed(self, max_diff_ratio: float = 0.0) -> bool:
+        return not (self.size_mismatch or self.baseline_missing) and self.diff_ratio <= max_diff_ratio
+
+
+class BaselineStore:
+    """
+    Content addressed storage for baseline screenshots.
+
+    Images are written once to objects/<sha256>.png and each baseline name
+    points at one of them through its own index/<name>.json, so identical
+    screenshots (the same control captured on several pages) are stored only
+    once and parallel workers never rewrite a shared index file.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_dir = self.root / "index"
+        self._decoded: Dict[str, np.ndarray] = {}
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / f"{digest}.png"
+
+    def _index_path(self, name: str) -> Path:
+        if not BASELINE_NAME.fullmatch(name):
+            raise ValueError(f"Invalid baseline name '{name}', use letters, digits, '_', '-' and '.'")
+        return self.index_dir / f"{name}.json"
+
+    def digest(self, name: str) -> Optional[str]:
+        """Return the content hash the baseline name points at or None if there is none"""
+        index_path = self._index_path(name)
+        if not index_path.exists():
+            return None
+        with open(index_path, "r") as f:
+            return json.load(f)["digest"]
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        """Return the decoded baseline for name or None if there is none (or its image is missing)"""
+        digest = self.digest(name)
+        if digest is None:
+            return None
+        if digest not in self._decoded:
+            object_path = self._object_path(digest)
+            if not object_path.exists():
+                return None
+            self._decoded[digest] = decode_screenshot(object_path.read_bytes())
+        return self._decoded[digest]
+
+    def put(self, name: str, pixels: np.ndarray, data: Optional[bytes] = None) -> str:
+        """
+        Store pixels as the baseline for name and return its content hash.
+
+        Args:
+            name: Baseline name
+            pixels: Decoded screenshot
+            data: Already encoded PNG bytes of pixels, encoded on demand if omitted
+        """
+        digest = content_hash(pixels)
+        path = self._object_path(digest)
+        if not path.exists():
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(path, data if data is not None else encode_image(pixels))
+        self._decoded[digest] = pixels
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(self._index_path(name), json.dumps({"digest": digest}, indent=4).encode())
+        return digest
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+class VisualChecker:
+    """Takes screenshots of pages or controls and compares them against stored baselines"""
+
+    def __init__(self, store: BaselineStore, diff_dir: Union[str, Path], tolerance: int = 0,
+                 perceptual: bool = True, threshold: float = 0.1, max_diff_ratio: float = 0.0,
+                 update_baselines: bool = False):
+        """
+        Initialize the visual checker
+
+        Args:
+            store: Storage with the baseline screenshots
+            diff_dir: Directory where diff images of failed comparisons are written
+            tolerance: Allowed per-channel difference for non perceptual comparison
+            perceptual: Compare using the perceptual colour model
+            threshold: Allowed perceptual difference (0..1)
+            max_diff_ratio: Allowed share of differing pixels for a check to pass
+            update_baselines: Overwrite baselines with the current screenshots
+        """
+        self.store = store
+        self.diff_dir = Path(diff_dir)
+        self.tolerance = tolerance
+        self.perceptual = perceptual
+        self.threshold = threshold
+        self.max_diff_ratio = max_diff_ratio
+        self.update_baselines = update_baselines
+
+    @staticmethod
+    def ignore_regions(target: Union[Page, Locator], ignore: Iterable[str],
+                       full_page: bool = False, scale: str = "device") -> List[Region]:
+        """
+        Resolve data-test values to regions relative to the screenshot of target.
+
+        Bounding boxes are in CSS pixels, they are multiplied by devicePixelRatio
+        unless the screenshot itself is taken with scale="css".
+
+        Args:
+            target: Page or Locator that is captured
+            ignore: data-test attribute values of the elements to ignore
+            full_page: Whether the page screenshot covers the whole scrollable page
+            scale: The scale option passed to Playwright screenshot()
+        """
+        ignore = list(ignore)
+        if not ignore:
+            return []
+        if isinstance(target, Locator):
+            page = target.page
+            origin = target.bounding_box() or {"x": 0, "y": 0}
+            offset_x, offset_y = -origin["x"], -origin["y"]
+        else:
+            page = target
+            offset_x, offset_y = page.evaluate("[window.scrollX, window.scrollY]") if full_page else (0, 0)
+
+        ratio = 1 if scale == "css" else page.evaluate("window.devicePixelRatio")
+
+        regions = []
+        for data_test_value in ignore:
+            for element in page.locator(f'[data-test="{data_test_value}"]').all():
+                box = element.bounding_box()
+                if box is not None:
+                    regions.append(((box["x"] + offset_x) * ratio, (box["y"] + offset_y) * ratio,
+                                    box["width"] * ratio, box["height"] * ratio))
+        return regions
+
+    def check(self, name: str, target: Union[Page, Locator], ignore: Iterable[str] = (),
+              **screenshot_kwargs) -> DiffResult:
+        """
+        Capture target and compare it with the baseline called name.
+
+        A missing baseline fails the check, the screenshot is written to
+        diff_dir as <name>_actual.png. Baselines are (re)recorded only when
+        update_baselines is set.
+
+        Args:
+            name: Baseline name
+            target: Page or Locator to capture
+            ignore: data-test attribute values of elements excluded from comparison
+            screenshot_kwargs: Extra arguments for Playwright screenshot()
+        """
+        regions = self.ignore_regions(target, ignore, screenshot_kwargs.get("full_page", False),
+                                      screenshot_kwargs.get("scale", "device"))
+        screenshot_kwargs.setdefault("animations", "disabled")
+        data = target.screenshot(type="png", **screenshot_kwargs)
+        actual = decode_screenshot(data)
+
+        if self.update_baselines:
+            self.store.put(name, actual, data)
+            return DiffResult(name, 0, actual.shape[0] * actual.shape[1], baseline_created=True)
+        expected = self.store.get(name)
+        if expected is None:
+            self._write_actual(name, data)
+            return DiffResult(name, 0, 0, baseline_missing=True)
+        if actual.shape != expected.shape:
+            self._write_actual(name, data)
+            return DiffResult(name, 0, 0, size_mismatch=True)
+
+        mask = build_mask(actual.shape, regions)
+        diff = compare_images(actual, expected, mask, tolerance=self.tolerance,
+                              perceptual=self.perceptual, threshold=self.threshold)
+        result = DiffResult(name, int(np.count_nonzero(diff)), int(np.count_nonzero(mask)))
+        if result.passed(self.max_diff_ratio):
+            return result
+
+        self.diff_dir.mkdir(parents=True, exist_ok=True)
+        diff_path = self.diff_dir / f"{name}_diff.png"
+        diff_path.write_bytes(encode_image(render_diff(expected, diff, mask)))
+        self._write_actual(name, data)
+        return DiffResult(result.name, result.diff_pixels, result.compared_pixels, diff_path=diff_path)
+
+    def _write_actual(self, name: str, data: bytes) -> Path:
+        self.diff_dir.mkdir(parents=True, exist_ok=True)
+        actual_path = self.diff_dir / f"{name}_actual.png"
+        actual_path.write_bytes(data)
+        return actual_path
+
+    def assert_matches(self, name: str, target: Union[Page, Locator], ignore: Iterable[str] = (),
+                       **screenshot_kwargs) -> DiffResult:
+        """Same as check() but raises AssertionError when the screenshot differs from the baseline"""
+        result = self.check(name, target, ignore, **screenshot_kwargs)
+        if result.baseline_missing:
+            raise AssertionError(
+                f"Screenshot '{name}' has no baseline, the actual screenshot was written to "
+                f"{self.diff_dir}, run with UPDATE_VISUAL_BASELINES=true to record it"
+            )
+        if result.size_mismatch:
+            raise AssertionError(f"Screenshot '{name}' size differs from the baseline")
+        if not result.passed(self.max_diff_ratio):
+            raise AssertionError(
+                f"Screenshot '{name}' differs from the baseline in {result.diff_pixels} pixels "
+                f"({result.diff_ratio:.2%}), see {result.diff_path}"
+            )
+        return result